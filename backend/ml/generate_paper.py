@@ -2,26 +2,50 @@ import os
 import sys
 import json
 import pickle
+import threading
 import traceback
 
 try:
     import pdfplumber
 except ImportError:
-    print(json.dumps({
-        "error": "Missing dependencies. Run: pip install pdfplumber google-genai"
-    }))
-    sys.exit(1)
+    # Checked in __main__ so sample_paper.py can reuse load_pattern without it
+    pdfplumber = None
 
 MODELS_DIR = "models"
 MODEL_PATH = os.path.join(MODELS_DIR, "pattern_model.pkl")
 
-# Ensure API Key is available
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    print(json.dumps({
-        "error": "GEMINI_API_KEY environment variable is not set."
-    }))
-    sys.exit(1)
+
+# How long the Gemini call may take before the server falls back to the question bank
+try:
+    LLM_TIMEOUT_MS = int(os.environ.get("LLM_TIMEOUT_MS", ""))
+except ValueError:
+    LLM_TIMEOUT_MS = 0
+if LLM_TIMEOUT_MS <= 0:
+    LLM_TIMEOUT_MS = 60000
+
+
+class LLMError(Exception):
+    """Raised when the Gemini call itself fails or returns unusable output."""
+
+
+def call_with_timeout(fn, timeout_seconds):
+    """Run fn on a daemon thread so a hung Gemini request cannot keep the process alive."""
+    result = {}
+
+    def run():
+        try:
+            result["value"] = fn()
+        except Exception as e:
+            result["error"] = e
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout_seconds)
+    if worker.is_alive():
+        raise LLMError(f"Gemini did not respond within {timeout_seconds:g} seconds.")
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
 
 
 def extract_notes_text(pdf_paths):
@@ -162,6 +186,33 @@ Student Notes Material (Compiled from Multiple PDFs):
 """
     return prompt
 
+def build_final_paper(subject, semester, sections):
+    """Wrap unit sections with the metadata the frontend expects."""
+    max_marks = 0
+    for section in sections:
+         # To calculate Max Marks for a Unit, we only count the highest set, effectively Set A since they are parallel
+         unit_marks = 0
+         for q in section.get("questions", []):
+              if q.get("text", "").strip().upper() == "OR":
+                   break # We've hit Set B
+              unit_marks += q.get("marks", 0)
+         max_marks += unit_marks
+
+    # Inject standard required metadata for the frontend to render it beautifully
+    return {
+         "id": f"GEN-{subject.replace(' ', '').upper()}-{semester}",
+         "university": "REVA UNIVERSITY",
+         "subject": subject,
+         "course": "B.Tech",
+         "semester": str(semester),
+         "studentName": "Student", # Will be mapped by React
+         "date": "TBD",
+         "timeAllowed": "3 Hours",
+         "maxMarks": max_marks if max_marks > 0 else 100,
+         "sections": sections
+    }
+
+
 def generate_paper(subject, semester, notes_pdf_paths):
     """Main execution block."""
     try:
@@ -175,48 +226,31 @@ def generate_paper(subject, semester, notes_pdf_paths):
         prompt = build_gemini_prompt(subject, semester, pattern_units, notes_text)
         
         # 4. Call Google Gemini using the new SDK
-        from google import genai
-        from google.genai import types
-        
-        client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-        
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-            ),
-        )
-        
-        raw_json = response.text
-        
-        # Verify it parses correctly before printing
-        parsed_json = json.loads(raw_json)
+        try:
+            from google import genai
+            from google.genai import types
+            
+            client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+            
+            # Only the Gemini call is timed; slow PDF extraction is not an LLM failure
+            response = call_with_timeout(lambda: client.models.generate_content(
+                model='gemini-2.5-flash',
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                ),
+            ), LLM_TIMEOUT_MS / 1000)
+            
+            raw_json = response.text
+            
+            # Verify it parses correctly before printing
+            parsed_json = json.loads(raw_json)
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(f"Gemini generation failed: {e}") from e
         
-        max_marks = 0
-        for section in parsed_json.get("sections", []):
-             # To calculate Max Marks for a Unit, we only count the highest set, effectively Set A since they are parallel
-             unit_marks = 0
-             found_or = False
-             for q in section.get("questions", []):
-                  if q.get("text", "").strip().upper() == "OR":
-                       break # We've hit Set B
-                  unit_marks += q.get("marks", 0)
-             max_marks += unit_marks
-
-        # Inject standard required metadata for the frontend to render it beautifully
-        final_paper = {
-             "id": f"GEN-{subject.replace(' ', '').upper()}-{semester}",
-             "university": "REVA UNIVERSITY",
-             "subject": subject,
-             "course": "B.Tech",
-             "semester": str(semester),
-             "studentName": "Student", # Will be mapped by React
-             "date": "TBD",
-             "timeAllowed": "3 Hours",
-             "maxMarks": max_marks if max_marks > 0 else 100,
-             "sections": parsed_json.get("sections", [])
-        }
+        final_paper = build_final_paper(subject, semester, parsed_json.get("sections", []))
         
         # 5. Print to STDOUT so Node.js can read it safely
         print(json.dumps(final_paper))
@@ -225,7 +259,9 @@ def generate_paper(subject, semester, notes_pdf_paths):
         # Print errors as JSON so Node.js backend can gracefully catch and surface them to React
         print(json.dumps({
             "error": str(e),
-            "trace": traceback.format_exc()
+            "trace": traceback.format_exc(),
+            # Lets Node.js fall back to the question bank only when the LLM itself failed
+            "llmFailure": isinstance(e, LLMError)
         }))
         sys.exit(1)
 
@@ -236,6 +272,20 @@ if __name__ == "__main__":
              "error": "Usage: python generate_paper.py \"<Subject Name>\" <Semester> \"<path/to/notes1.pdf>\" [path2...]"
          }))
          sys.exit(1)
+
+    if pdfplumber is None:
+        print(json.dumps({
+            "error": "Missing dependencies. Run: pip install pdfplumber google-genai"
+        }))
+        sys.exit(1)
+
+    # Ensure API Key is available
+    if not os.environ.get("GEMINI_API_KEY"):
+        print(json.dumps({
+            "error": "GEMINI_API_KEY environment variable is not set.",
+            "llmFailure": True
+        }))
+        sys.exit(1)
          
     subject_arg = sys.argv[1]
     semester_arg = sys.argv[2]
@@ -0,0 +1,305 @@
+import os
+import re
+import sys
+import json
+import glob
+import random
+import traceback
+
+from generate_paper import load_pattern, build_final_paper
+
+DATA_DIR = "data"
+
+ROMAN_UNITS = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5, "VI": 6}
+
+# Unit headers ("UNIT – II") survive extraction glued onto the neighbouring blocks;
+# they are the only reliable unit boundaries, the corpus' "unit" tags are not
+UNIT_HEADER_PATTERN = re.compile(r'\bUNIT\s*[–-]?\s*([IVX]+|[0-9]+)\b')
+TRAILING_OR_PATTERN = re.compile(r'\s*\bOR\s*$')
+PAGE_FOOTER_PATTERN = re.compile(r'\s*\bPage\s+\d+\s+of\s+\d+\b', re.IGNORECASE)
+# Sub-question markers inside an unparsed block: "a) ... b) ... c) ..."
+SUB_QUESTION_PATTERN = re.compile(r'(?:^|\s)([a-h])\)\s+')
+# A marks-column value is a bare whitespace-delimited number ("0-9", "“12”" are content)
+INLINE_MARKS_PATTERN = re.compile(r'(?<!\S)([1-9]|1[0-9]|20)(?!\S)')
+# The marks column is printed beside the first line of each sub-question, so after
+# extraction it lands this many characters into the part (or at the end of a one-line part)
+MARKS_COLUMN_WINDOW = (55, 120)
+
+
+def normalize_name(name):
+    return " ".join(name.lower().split())
+
+
+def parse_unit(raw_unit):
+    """Map a unit label ('1', 'IV', ...) onto the pattern's unit numbers."""
+    raw_unit = str(raw_unit).strip().upper()
+    if raw_unit.isdigit():
+        return int(raw_unit)
+    return ROMAN_UNITS.get(raw_unit)
+
+
+def clean_question_text(text):
+    text = " ".join(text.split())
+    text = PAGE_FOOTER_PATTERN.sub("", text)
+    return TRAILING_OR_PATTERN.sub("", text).strip()
+
+
+def find_inline_marks(body):
+    """
+    Locate the marks-column number inside a sub-question. Returns the regex match, or
+    None when there is no candidate or more than one, since guessing would feed wrong
+    marks into the subset-sum.
+    """
+    window_start, window_end = MARKS_COLUMN_WINDOW
+    candidates = [
+        m for m in INLINE_MARKS_PATTERN.finditer(body)
+        if window_start <= m.start() <= window_end or (m.end() == len(body) and m.start() < window_start)
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def split_block(text):
+    """
+    Break a zero-mark block (a whole Set pasted as one question) into its sub-questions,
+    recovering each part's marks from the inline marks column. Parts whose marks cannot
+    be found with confidence are dropped.
+    """
+    parts = SUB_QUESTION_PATTERN.split(clean_question_text(text))
+    questions = []
+    # split() yields [prefix, label, body, label, body, ...]
+    for body in parts[2::2]:
+        body = clean_question_text(body)
+        mark_match = find_inline_marks(body)
+        if mark_match is None:
+            continue
+        part_text = clean_question_text(body[:mark_match.start()] + " " + body[mark_match.end():])
+        if part_text:
+            questions.append({"text": part_text, "marks": int(mark_match.group(1))})
+    return questions
+
+
+def split_by_unit_headers(text, current_unit):
+    """
+    Yield (unit, segment) pairs for a raw corpus entry. Text before the first header
+    belongs to `current_unit`; each header switches the unit for what follows it.
+    """
+    pieces = UNIT_HEADER_PATTERN.split(text)
+    yield current_unit, pieces[0]
+    for label, segment in zip(pieces[1::2], pieces[2::2]):
+        current_unit = parse_unit(label) or current_unit
+        yield current_unit, segment
+
+
+def load_question_bank(subject, semester):
+    """Load every usable historical question for this subject, grouped by unit."""
+    wanted = normalize_name(subject)
+    subject_dirs = [
+        d for d in glob.glob(os.path.join(DATA_DIR, "*"))
+        if os.path.isdir(d) and normalize_name(os.path.basename(d)) == wanted
+    ]
+    if not subject_dirs:
+        raise Exception(f"No historical questions found for subject '{subject}'.")
+
+    # Prefer the requested semester, but any semester of the same subject is a valid source
+    paths = []
+    for subject_dir in subject_dirs:
+        paths.extend(glob.glob(os.path.join(subject_dir, f"sem{semester}", "*.json")))
+    if not paths:
+        for subject_dir in subject_dirs:
+            paths.extend(glob.glob(os.path.join(subject_dir, "*", "*.json")))
+
+    by_unit = {}
+    seen_texts = set()
+    for path in sorted(paths):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                paper_data = json.load(f)
+        except Exception as e:
+            print(f"[Warning] Failed to read question file {path}: {e}", file=sys.stderr)
+            continue
+
+        # Each file is one paper in print order, which opens with UNIT 1
+        current_unit = 1
+        for q in paper_data.get("questions", []):
+            marks = q.get("marks", 0)
+            if not isinstance(marks, int):
+                continue
+
+            segments = split_by_unit_headers(q.get("text", ""), current_unit)
+            for segment_index, (current_unit, segment) in enumerate(segments):
+                # Zero-mark entries are whole unparsed blocks, not single questions
+                if marks == 0:
+                    candidates = split_block(segment)
+                elif segment_index == 0 and clean_question_text(segment):
+                    # Anything after a header is the next unit's spill-over, not this question
+                    candidates = [{"text": clean_question_text(segment), "marks": marks}]
+                else:
+                    candidates = []
+
+                for candidate in candidates:
+                    if candidate["text"] in seen_texts:
+                        continue
+                    seen_texts.add(candidate["text"])
+                    by_unit.setdefault(current_unit, []).append(candidate)
+
+    if not by_unit:
+        raise Exception(f"The question bank for '{subject}' has no questions with marks assigned.")
+    return by_unit
+
+
+def pick_questions(pool, target, used, rng, exact=True, max_count=None):
+    """
+    Subset-sum over marks: choose questions not in `used` whose marks add up to `target`,
+    preferring the fewest questions and never more than `max_count`. With exact=False the
+    reachable total closest to the target is accepted instead. Returns None if nothing fits.
+    """
+    candidates = [q for q in pool if id(q) not in used]
+    rng.shuffle(candidates)
+    if max_count is None:
+        max_count = len(candidates)
+    if max_count < 1:
+        return None
+
+    # Leave room for every single question when any total is acceptable
+    capacity = target if exact else target + max((q["marks"] for q in candidates), default=0)
+    # best[s] holds the shortest combination found so far summing to s
+    best = [None] * (capacity + 1)
+    best[0] = []
+    for q in candidates:
+        weight = q["marks"]
+        for s in range(capacity, weight - 1, -1):
+            prev = best[s - weight]
+            if prev is None or len(prev) + 1 > max_count:
+                continue
+            if best[s] is None or len(prev) + 1 < len(best[s]):
+                best[s] = prev + [q]
+        if best[target] is not None and len(best[target]) == 1:
+            break
+
+    if best[target] or exact:
+        return best[target]
+    reachable = [s for s in range(1, capacity + 1) if best[s]]
+    if not reachable:
+        return None
+    return best[min(reachable, key=lambda s: (abs(s - target), s))]
+
+
+def fill_unit(pool, slot_marks, paper_used, rng, max_per_slot=None):
+    """
+    Choose questions for all of a unit's slots together. Each pick is capped so enough
+    unused questions remain for the slots still to fill, which stops one slot combining
+    questions the later slots need. Returns (chosen per slot, off_pattern) or None.
+    """
+    used = set(paper_used)
+    available = len([q for q in pool if id(q) not in used])
+    filled = []
+    off_pattern = False
+
+    for slot_index, marks in enumerate(slot_marks):
+        remaining_slots = len(slot_marks) - slot_index - 1
+        max_count = available - remaining_slots
+        if max_per_slot is not None:
+            max_count = min(max_count, max_per_slot)
+
+        chosen = pick_questions(pool, marks, used, rng, max_count=max_count)
+        if chosen is None:
+            # Historical marks rarely line up with the pattern exactly; take the
+            # closest total and report it truthfully rather than relabelling
+            chosen = pick_questions(pool, marks, used, rng, exact=False, max_count=max_count)
+            off_pattern = True
+        if chosen is None:
+            return None
+
+        used.update(id(q) for q in chosen)
+        available -= len(chosen)
+        filled.append(chosen)
+
+    return filled, off_pattern
+
+
+def format_question(chosen):
+    if len(chosen) == 1:
+        return chosen[0]["text"]
+    return " ".join(f"({part}) {q['text']}" for part, q in zip("abcdefgh", chosen))
+
+
+def sample_paper(subject, semester, seed=None):
+    """Assemble a paper matching the mark pattern purely from the historical question bank."""
+    try:
+        rng = random.Random(seed)
+        pattern_units = load_pattern(subject, semester)
+        by_unit = load_question_bank(subject, semester)
+
+        # No question is ever printed twice in a paper, across sets or units
+        paper_used = set()
+        off_pattern = False
+        question_number = 1
+        sections = []
+
+        for unit_index, (unit_name, sets) in enumerate(pattern_units.items(), start=1):
+            display_name = unit_name.upper().replace('UNIT', 'UNIT ')
+            unit_match = re.search(r'\d+', unit_name)
+            unit_pool = by_unit.get(int(unit_match.group(0)) if unit_match else unit_index, [])
+
+            set_a_marks = sets.get("setA", [10, 10, 5])
+            set_b_marks = sets.get("setB", [10, 10, 5])
+            slot_marks = set_a_marks + set_b_marks
+
+            result = fill_unit(unit_pool, slot_marks, paper_used, rng)
+            if result is None:
+                # Combinations can still strand a slot; one question per slot always fits
+                # when the unit has at least as many questions as slots
+                result = fill_unit(unit_pool, slot_marks, paper_used, rng, max_per_slot=1)
+            if result is None:
+                raise Exception(f"Question bank for '{subject}' is too small to fill {display_name}.")
+
+            filled, unit_off_pattern = result
+            off_pattern = off_pattern or unit_off_pattern
+
+            questions = []
+            for slot_index, chosen in enumerate(filled):
+                if slot_index == len(set_a_marks):
+                    questions.append({"text": "OR", "marks": 0})
+                set_label = "A" if slot_index < len(set_a_marks) else "B"
+
+                paper_used.update(id(q) for q in chosen)
+                questions.append({
+                    "text": f"Set {set_label}: {question_number}) {format_question(chosen)}",
+                    "marks": sum(q["marks"] for q in chosen)
+                })
+                question_number += 1
+
+            sections.append({
+                "name": display_name,
+                "instructions": "Answer ONE full set (Set A OR Set B)",
+                "questions": questions
+            })
+
+        final_paper = build_final_paper(subject, semester, sections)
+        # Some slots carry their real historical marks instead of the pattern's; the
+        # Generate page warns the user when this paper is served as the fallback
+        final_paper["offPattern"] = off_pattern
+
+        # Print to STDOUT so Node.js can read it safely
+        print(json.dumps(final_paper))
+
+    except Exception as e:
+        print(json.dumps({
+            "error": str(e),
+            "trace": traceback.format_exc()
+        }))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+         print(json.dumps({
+             "error": "Usage: python sample_paper.py \"<Subject Name>\" <Semester> [seed]"
+         }))
+         sys.exit(1)
+
+    subject_arg = sys.argv[1]
+    semester_arg = sys.argv[2]
+    seed_arg = sys.argv[3] if len(sys.argv) > 3 else None
+
+    sample_paper(subject_arg, semester_arg, seed_arg)
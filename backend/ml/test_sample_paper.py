@@ -0,0 +1,163 @@
+import json
+import random
+
+import pytest
+
+import sample_paper
+from sample_paper import split_block, split_by_unit_headers, pick_questions, parse_unit, clean_question_text
+
+# Blocks taken verbatim from data/Data Structures/sem0/questions_B18CS5020.json
+CIPHER_BLOCK = (
+    "a) To maintain the privacy of information transferred from one place to another place our 5 "
+    "INDIAN ARMED FORCE has to implement some cryptographic techniques such as message "
+    "encryption(encoding) and decryption(decoding). One of the basic encryption/decryption algorithm "
+    "is Caesar Cipher algorithm. We have already seen the java program working for message having "
+    "uppercase alphabets. Construct a caesar cipher program to also encrypt/decrypt numbers 0-9 and "
+    "lower case alphabets. b) Define 1D arrays and also explain its syntax and instantiation. "
+    "Construct a java program to 8 search for an element by considering an array of n elements. "
+    "Also show tracing of the program. OR"
+)
+LINKED_LIST_BLOCK = (
+    "a) Consider the below list which is maintained in increasing order. Construct a java program to 8 "
+    "perform the below operations and also explain the same with diagrams. i. Insert a new node with "
+    "the data “12” at appropriate position. ii. Print the elements from the list. b) Suggest to "
+    "preference of a singly or a doubly linked lists for traversing through a list of 4 elements? "
+    "justify your answer with an example. OR"
+)
+
+
+def test_split_block_reads_marks_column_not_content_numbers():
+    parts = split_block(CIPHER_BLOCK)
+    assert [p["marks"] for p in parts] == [5, 8]
+    assert "our INDIAN ARMED FORCE" in parts[0]["text"]
+    assert "numbers 0-9" in parts[0]["text"]
+    assert "program to search" in parts[1]["text"]
+    assert not parts[1]["text"].endswith("OR")
+
+
+def test_split_block_ignores_quoted_data_values():
+    parts = split_block(LINKED_LIST_BLOCK)
+    assert [p["marks"] for p in parts] == [8, 4]
+    assert "program to perform" in parts[0]["text"]
+    assert "“12”" in parts[0]["text"]
+
+
+def test_split_block_drops_parts_without_confident_marks():
+    parts = split_block("a) Explain the working of a stack. b) Distinguish between SLL and DLL 5")
+    assert parts == [{"text": "Distinguish between SLL and DLL", "marks": 5}]
+
+
+def test_split_by_unit_headers_switches_unit_after_header():
+    segments = list(split_by_unit_headers("a) Distinguish between SLL and DLL 5 UNIT – II a) Next", 1))
+    assert [unit for unit, _ in segments] == [1, 2]
+    assert segments[1][1].strip() == "a) Next"
+
+
+def test_parse_unit():
+    assert parse_unit("1") == 1
+    assert parse_unit("IV") == 4
+    assert parse_unit(" iii ") == 3
+    assert parse_unit("") is None
+
+
+def test_pick_questions_exact_sum_prefers_fewest():
+    pool = [{"text": str(m), "marks": m} for m in (8, 7, 5, 5, 10)]
+    chosen = pick_questions(pool, 10, set(), random.Random(0))
+    assert [q["marks"] for q in chosen] == [10]
+
+
+def test_pick_questions_never_reuses_questions():
+    pool = [{"text": str(m), "marks": m} for m in (8, 7, 5, 5, 10)]
+    used = {id(pool[4])}
+    chosen = pick_questions(pool, 10, used, random.Random(0))
+    assert sorted(q["marks"] for q in chosen) == [5, 5]
+
+    used.update(id(q) for q in chosen)
+    assert pick_questions(pool, 10, used, random.Random(0)) is None
+
+
+def test_pick_questions_closest_total_when_not_exact():
+    pool = [{"text": str(m), "marks": m} for m in (8, 7)]
+    chosen = pick_questions(pool, 10, set(), random.Random(0), exact=False)
+    assert [q["marks"] for q in chosen] == [8]
+
+
+def test_clean_question_text_strips_page_footer_and_or():
+    text = "Define Stack and list out the drawbacks of array. Page 1 of 2 OR"
+    assert clean_question_text(text) == "Define Stack and list out the drawbacks of array."
+
+
+PATTERN = {
+    "unit1": {"setA": [10, 10, 5], "setB": [10, 10, 5]},
+    "unit2": {"setA": [10, 10, 5], "setB": [10, 10, 5]},
+}
+
+
+def write_bank(tmp_path, unit_marks):
+    """One paper file whose units are separated by "UNIT – N" headers, as in data/."""
+    questions = []
+    for unit, marks_list in enumerate(unit_marks, start=1):
+        for i, marks in enumerate(marks_list):
+            text = f"Unit {unit} question {i} about stacks and queues."
+            if i == len(marks_list) - 1 and unit < len(unit_marks):
+                text += f" UNIT – {'I' * (unit + 1)}"
+            questions.append({"text": text, "marks": marks, "section": "A", "unit": "1"})
+
+    paper_dir = tmp_path / "data" / "Data Structures" / "sem3"
+    paper_dir.mkdir(parents=True)
+    (paper_dir / "questions_TEST.json").write_text(json.dumps({"questions": questions}), encoding="utf-8")
+
+
+def run_sampler(tmp_path, monkeypatch, capsys, unit_marks):
+    write_bank(tmp_path, unit_marks)
+    monkeypatch.setattr(sample_paper, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(sample_paper, "load_pattern", lambda subject, semester: PATTERN)
+    sample_paper.sample_paper("Data Structures", 3, seed=1)
+    return json.loads(capsys.readouterr().out)
+
+
+def paper_texts(paper):
+    return [
+        q["text"].split(") ", 1)[1]
+        for section in paper["sections"]
+        for q in section["questions"] if q["text"] != "OR"
+    ]
+
+
+def test_sample_paper_output_shape(tmp_path, monkeypatch, capsys):
+    paper = run_sampler(tmp_path, monkeypatch, capsys, [[10, 10, 5, 10, 10, 5]] * 2)
+
+    assert paper["subject"] == "Data Structures"
+    assert paper["maxMarks"] == 50
+    assert paper["offPattern"] is False
+    assert [s["name"] for s in paper["sections"]] == ["UNIT 1", "UNIT 2"]
+
+    unit1 = paper["sections"][0]["questions"]
+    assert unit1[3] == {"text": "OR", "marks": 0}
+    assert [q["marks"] for q in unit1] == [10, 10, 5, 0, 10, 10, 5]
+    assert unit1[0]["text"].startswith("Set A: 1) Unit 1 ")
+    assert unit1[4]["text"].startswith("Set B: 4) Unit 1 ")
+    assert paper["sections"][1]["questions"][0]["text"].startswith("Set A: 7) Unit 2 ")
+
+
+def test_sample_paper_never_repeats_a_question(tmp_path, monkeypatch, capsys):
+    paper = run_sampler(tmp_path, monkeypatch, capsys, [[5] * 12, [5] * 12])
+    texts = paper_texts(paper)
+    assert len(texts) == len(set(texts))
+
+
+def test_sample_paper_does_not_starve_later_slots(tmp_path, monkeypatch, capsys):
+    # 5+5 fits the first 10M slot exactly, but would leave the last slot empty
+    paper = run_sampler(tmp_path, monkeypatch, capsys, [[5, 5, 5, 5, 10, 10], [5] * 6])
+
+    assert paper["offPattern"] is True
+    for section in paper["sections"]:
+        assert len([q for q in section["questions"] if q["text"] != "OR"]) == 6
+    texts = paper_texts(paper)
+    assert len(texts) == len(set(texts)) == 12
+
+
+def test_sample_paper_reports_too_small_bank(tmp_path, monkeypatch, capsys):
+    with pytest.raises(SystemExit):
+        run_sampler(tmp_path, monkeypatch, capsys, [[5] * 6, [5] * 5])
+    assert "too small to fill UNIT 2" in json.loads(capsys.readouterr().out)["error"]
@@ -94,6 +94,47 @@ if (!fs.existsSync(uploadDir)) {
 const isWindows = process.platform === 'win32';
 const PYTHON_CMD = isWindows ? 'py' : 'python3';
 
+// The Gemini call gets this long before the offline question-bank sampler takes over.
+// generate_paper.py enforces it around the LLM call only, so PDF extraction is not counted.
+const parsedLlmTimeout = parseInt(process.env.LLM_TIMEOUT_MS, 10);
+const LLM_TIMEOUT_MS = Number.isFinite(parsedLlmTimeout) && parsedLlmTimeout > 0 ? parsedLlmTimeout : 60000;
+
+// Assemble a paper from historical questions in data/ (no LLM call). Resolves with the paper JSON string.
+const runQuestionBankSampler = (rootDir, subject, semester) => new Promise((resolve, reject) => {
+    const samplerScriptPath = path.join(rootDir, 'backend', 'ml', 'sample_paper.py');
+    const samplerProcess = spawn(PYTHON_CMD, [
+        samplerScriptPath,
+        subject,
+        semester.toString()
+    ], { cwd: rootDir });
+
+    let outputData = '';
+
+    samplerProcess.stdout.on('data', (data) => {
+        outputData += data.toString();
+    });
+
+    samplerProcess.stderr.on('data', (data) => {
+        console.error(`[SAMPLER STDERR]: ${data.toString()}`);
+    });
+
+    samplerProcess.on('error', reject);
+
+    samplerProcess.on('close', (code) => {
+        const paperText = outputData.trim();
+        let parsed;
+        try {
+            parsed = JSON.parse(paperText);
+        } catch (e) {
+            return reject(new Error('Question bank sampler returned invalid output.'));
+        }
+        if (code !== 0 || parsed.error) {
+            return reject(new Error(parsed.error || `Question bank sampler exited with code ${code}`));
+        }
+        resolve(paperText);
+    });
+});
+
 const storage = multer.diskStorage({
     destination: function (req, file, cb) {
         cb(null, uploadDir)
@@ -543,7 +584,7 @@ app.post('/api/generate-paper', upload.array('notes', 10), async (req, res) => {
             subject,
             semester.toString(),
             ...pdfPaths
-        ], { cwd: rootDir });
+        ], { cwd: rootDir, env: { ...process.env, LLM_TIMEOUT_MS: String(LLM_TIMEOUT_MS) } });
 
         let outputData = '';
         let errorData = '';
@@ -565,35 +606,47 @@ app.post('/api/generate-paper', upload.array('notes', 10), async (req, res) => {
                 });
             });
 
-            if (code !== 0) {
-                console.error(`[GENERATOR] Python process exited with code ${code}`);
-                try {
-                    const parsed = JSON.parse(outputData.trim());
-                    if (parsed.error) {
-                        return res.status(500).json({ success: false, error: parsed.error });
-                    }
-                } catch (e) {
-                    // Fallback if not parsable JSON error
-                }
-                return res.status(500).json({ success: false, error: 'AI Pipeline failed during execution. See server logs.' });
-            }
-
             try {
                 // The AI Python script prints the paper content (as a JSON string representing the paper or plain text).
-                const paperText = outputData.trim();
-
+                let paperText = outputData.trim();
+                let source = 'llm';
+                let pipelineError = null;
+                // Only a slow or failing LLM justifies a question-bank paper; user errors
+                // (e.g. unreadable notes) must reach the client as errors
+                let canFallBack = false;
+
+                if (code !== 0) {
+                    console.error(`[GENERATOR] Python process exited with code ${code}`);
+                    pipelineError = 'AI Pipeline failed during execution. See server logs.';
+                }
                 // If the python script fails cleanly, it might output a JSON error
                 try {
                     const parsed = JSON.parse(paperText);
                     if (parsed.error) {
                         console.error('[GENERATOR] Pipeline Error:', parsed.error);
                         if (parsed.trace) console.error(parsed.trace);
-                        return res.status(500).json({ success: false, error: parsed.error });
+                        pipelineError = parsed.error;
+                        canFallBack = parsed.llmFailure === true;
                     }
                 } catch (e) {
                     // Ignore parsing error, it means the output is valid raw text/json representation
                 }
 
+                if (pipelineError) {
+                    if (!canFallBack) {
+                        return res.status(500).json({ success: false, error: pipelineError });
+                    }
+
+                    console.warn(`[GENERATOR] ${pipelineError} Falling back to question bank sampler...`);
+                    try {
+                        paperText = await runQuestionBankSampler(rootDir, subject, semester);
+                        source = 'question_bank';
+                    } catch (samplerError) {
+                        console.error('[GENERATOR] Question bank fallback failed:', samplerError.message);
+                        return res.status(500).json({ success: false, error: pipelineError });
+                    }
+                }
+
                 // Use the working PostgreSQL connection pool to insert data matching the schema
                 const query = `
                   INSERT INTO papers (user_id, subject, semester, student_name, full_json_data)
@@ -614,7 +667,8 @@ app.post('/api/generate-paper', upload.array('notes', 10), async (req, res) => {
                 // Return payload matching the exact structured response requested
                 return res.status(200).json({
                     success: true,
-                    paper: paperText
+                    paper: paperText,
+                    source
                 });
 
             } catch (e) {
@@ -631,6 +685,53 @@ app.post('/api/generate-paper', upload.array('notes', 10), async (req, res) => {
 });
 
 
+// POST /api/practice-paper: Offline practice paper sampled from the historical question bank (no LLM call)
+app.post('/api/practice-paper', async (req, res) => {
+    try {
+        const { subject, semester, user_id } = req.body;
+
+        if (!subject || !semester || !user_id) {
+            return res.status(400).json({ success: false, error: 'Missing required fields (subject, semester, or user_id)' });
+        }
+
+        console.log(`[PRACTICE] Sampling question bank for ${subject} Sem ${semester}...`);
+
+        const rootDir = process.cwd().endsWith('backend') ? path.join(process.cwd(), '..') : process.cwd();
+
+        let paperText;
+        try {
+            paperText = await runQuestionBankSampler(rootDir, subject, semester);
+        } catch (samplerError) {
+            console.error('[PRACTICE] Sampler Error:', samplerError.message);
+            return res.status(500).json({ success: false, error: samplerError.message });
+        }
+
+        const query = `
+          INSERT INTO papers (user_id, subject, semester, student_name, full_json_data)
+          VALUES ($1, $2, $3, $4, $5)
+          RETURNING *;
+        `;
+        const values = [user_id, subject, semester.toString(), "Student", paperText];
+
+        try {
+            await pool.query(query, values);
+        } catch (dbError) {
+            console.error('[PRACTICE] Supabase insertion error:', dbError);
+            return res.status(500).json({ success: false, error: 'Failed to insert paper into Supabase database' });
+        }
+
+        return res.status(200).json({
+            success: true,
+            paper: paperText,
+            source: 'question_bank'
+        });
+
+    } catch (error) {
+        console.error('[PRACTICE] Server execution error:', error);
+        return res.status(500).json({ success: false, error: 'Internal server error during practice paper generation' });
+    }
+});
+
 // 1. GET /api/profile/:userId: Fetch user profile from PostgreSQL
 app.get('/api/profile/:userId', async (req, res) => {
     try {
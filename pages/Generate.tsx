@@ -107,6 +107,13 @@ const Generate: React.FC<GenerateProps> = ({ onPaperGenerated, setGlobalLoading
         onPaperGenerated(parsedPaper);
         setGlobalLoading({ active: false, message: "", subMessage: "" });
 
+        if (result.source === 'question_bank') {
+          const marksNote = parsedPaper.offPattern
+            ? " Some questions keep their original marks, so they may not match the usual exam pattern."
+            : "";
+          alert(`AI generation was unavailable, so this paper was assembled from past question papers instead of your notes.${marksNote}`);
+        }
+
         setTimeout(() => {
           navigate('/result', { state: { paper: parsedPaper }, replace: true });
         }, 50);
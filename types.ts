@@ -20,6 +20,7 @@ export interface QuestionPaper {
     instructions: string;
     questions: Question[];
   }[];
+  offPattern?: boolean; // Question-bank papers whose marks could not match the pattern exactly
 }
 
 export interface GenerationParams {